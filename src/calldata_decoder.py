@@ -2,55 +2,255 @@
 Calldata Decoder - Decode transaction calldata into human-readable format
 """
 import logging
-from typing import Dict, List, Optional, Any
-from eth_abi import decode
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    # C-accelerated drop-in replacement for eth_abi (same call signatures)
+    from faster_eth_abi import decode
+except ImportError:
+    from eth_abi import decode
 from eth_utils import to_hex
 
+from .hex_fast import bytes_to_hex
+from .selectors_builtin import SELECTOR_LUT
+
 logger = logging.getLogger(__name__)
 
+# Lightweight decoded-parameter record; converted to dicts only at the
+# JSON response boundary
+Param = namedtuple("Param", "name type value")
+
+
+@lru_cache(maxsize=1024)
+def _type_family(param_type: str) -> Tuple[str, Optional[str]]:
+    """Classify an ABI type into a handler family, once per distinct type
+
+    Returns (family, element_type); element_type is set for arrays only.
+    """
+    if param_type.endswith("]"):
+        return "array", param_type[:param_type.rindex("[")]
+    if param_type.startswith("("):
+        return "tuple", None
+    if param_type == "address":
+        return "address", None
+    if param_type == "bool":
+        return "bool", None
+    if param_type == "string":
+        return "string", None
+    if param_type.startswith("bytes"):
+        return "bytes", None
+    if param_type.startswith(("uint", "int")):
+        return "int", None
+    return "default", None
+
+
+@lru_cache(maxsize=1024)
+def _tuple_component_types(param_type: str) -> Tuple[str, ...]:
+    """Split a tuple type like "(bytes,address,uint256)" into its
+    top-level component types, once per distinct type
+
+    Nested tuples stay intact ("(a,(b,c))" -> ("a", "(b,c)")); each
+    component is classified recursively by _format_value.
+    """
+    inner = param_type[1:-1]
+    if not inner:
+        return ()
+    components, depth, start = [], 0, 0
+    for i, ch in enumerate(inner):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            components.append(inner[start:i])
+            start = i + 1
+    components.append(inner[start:])
+    return tuple(components)
+
+
+def _fmt_hex(value: Any) -> Any:
+    return bytes_to_hex(value) if isinstance(value, bytes) else value
+
+
+def _fmt_int(value: Any) -> int:
+    return int(value) if value is not None else 0
+
+
+def _fmt_bool(value: Any) -> bool:
+    return bool(value)
+
+
+def _fmt_str(value: Any) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="ignore")
+    return str(value)
+
+
+def _fmt_identity(value: Any) -> Any:
+    return value
+
+
+# Static single-word ABI types eligible for the slice-based fast path
+_STATIC_WORD_TYPES = frozenset(
+    ["address", "bool", "bytes32"]
+    + [f"uint{n}" for n in range(8, 257, 8)]
+    + [f"int{n}" for n in range(8, 257, 8)]
+)
+
+# Per-word type codes for the static fast-path kernel
+_TC_ADDRESS, _TC_UINT, _TC_INT, _TC_BOOL, _TC_BYTES32 = range(5)
+
+# Zero-padding templates the fast path checks words against; eth_abi
+# rejects nonzero padding bytes, and the fast path must match it so
+# malformed calldata fails identically on both paths
+_PAD12 = bytes(12)
+_PAD31 = bytes(31)
+
+
+@lru_cache(maxsize=1024)
+def _static_plan(
+    types_key: Tuple[str, ...]
+) -> Optional[Tuple[Tuple[int, int], ...]]:
+    """Compile a type tuple into per-word (code, bits) pairs, once per
+    signature
+
+    `bits` is the declared width for uintN/intN (0 otherwise), used for
+    the fast path's range checks. Returns None when any type is dynamic
+    (caller uses eth_abi), so the per-request word scan never
+    re-examines type strings.
+    """
+    codes = []
+    for t in types_key:
+        if t == "address":
+            codes.append((_TC_ADDRESS, 0))
+        elif t == "bool":
+            codes.append((_TC_BOOL, 0))
+        elif t == "bytes32":
+            codes.append((_TC_BYTES32, 0))
+        elif t in _STATIC_WORD_TYPES:
+            if t.startswith("int"):
+                codes.append((_TC_INT, int(t[3:])))
+            else:
+                codes.append((_TC_UINT, int(t[4:])))
+        else:
+            return None
+    return tuple(codes)
+
+
+# Per-family formatters; array and tuple are handled in _format_value
+# (they recurse per element/component)
+_FAMILY_HANDLERS = {
+    "address": _fmt_hex,
+    "bytes": _fmt_hex,
+    "int": _fmt_int,
+    "bool": _fmt_bool,
+    "string": _fmt_str,
+    "default": _fmt_identity,
+}
+
 
 class CalldataDecoder:
     """Decode transaction calldata"""
 
+    # Max number of selector -> signature-info entries memoized per decoder
+    SIG_CACHE_MAX = 4096
+
     def __init__(self, signature_lookup):
         self.signature_lookup = signature_lookup
+        # selector -> {name, signature, params, types_only}; hot selectors
+        # (ERC20 transfer/approve...) recur constantly, so memoizing the
+        # lookup plus the name-stripping pass makes repeat decodes I/O-free
+        self._sig_cache: Dict[str, Dict] = {}
 
     async def decode_calldata(
         self,
-        calldata: str,
-        known_abi: Optional[List[Dict]] = None
+        calldata,
+        known_abi: Optional[List[Dict]] = None,
+        human_readable: bool = False
     ) -> Dict:
         """
         Decode transaction calldata
 
         Args:
-            calldata: Hex-encoded calldata (e.g., "0xa9059cbb000...")
+            calldata: Hex-encoded calldata (e.g., "0xa9059cbb000..."),
+                or already-parsed raw bytes from a caller that has
+                validated the hex upfront
             known_abi: Optional ABI if known
+            human_readable: Also build the human_readable summary string
+                (off by default - most programmatic consumers only read
+                the structured parameters)
 
         Returns:
             Dict with decoded information
         """
-        if not calldata or len(calldata) < 10:
+        if not calldata:
             return {
                 "error": "Invalid calldata - too short"
             }
 
-        # Normalize
-        if not calldata.startswith("0x"):
-            calldata = "0x" + calldata
+        if isinstance(calldata, (bytes, bytearray)):
+            # Caller already parsed the hex; don't re-parse
+            raw = bytes(calldata)
+            if len(raw) < 4:
+                return {
+                    "error": "Invalid calldata - too short"
+                }
+        else:
+            # Track the 0x prefix as an integer offset instead of
+            # rebuilding the string, then parse hex -> bytes once;
+            # slicing bytes is cheap compared with slicing the hex
+            # string and re-parsing it
+            offset = 2 if calldata.startswith(("0x", "0X")) else 0
+            if len(calldata) - offset < 8:
+                return {
+                    "error": "Invalid calldata - too short"
+                }
+
+            try:
+                raw = bytes.fromhex(calldata[offset:])
+            except ValueError:
+                return {
+                    "error": "Invalid calldata - not valid hex"
+                }
 
         # Extract function selector (first 4 bytes)
-        function_selector = calldata[:10]
-        params_data = calldata[10:]
-
-        # Look up signature
-        signature_info = await self.signature_lookup.lookup_signature(function_selector)
+        function_selector = "0x" + raw[:4].hex()
+        params_bytes = raw[4:]
+
+        # Look up signature (memoized per selector)
+        signature_info = self._sig_cache.get(function_selector)
+        if signature_info is None:
+            # Static tier: well-known selectors resolve without any await
+            looked_up = SELECTOR_LUT.get(function_selector)
+            if looked_up is None:
+                # Warm lookup caches are also reachable synchronously
+                looked_up = self.signature_lookup.lookup_signature_sync(function_selector)
+            if looked_up is None:
+                looked_up = await self.signature_lookup.lookup_signature(function_selector)
+            if looked_up:
+                # Pre-split "type name" params once so repeat decodes skip it
+                types_only, names = [], []
+                for i, p in enumerate(looked_up.params):
+                    t, _, n = p.partition(" ")
+                    types_only.append(t)
+                    names.append(n or f"param{i}")
+                signature_info = {
+                    "name": looked_up.name,
+                    "signature": looked_up.signature,
+                    "params": looked_up.params,
+                    "types_only": types_only,
+                    "param_names": names,
+                }
+                if len(self._sig_cache) < self.SIG_CACHE_MAX:
+                    self._sig_cache[function_selector] = signature_info
 
         if not signature_info:
             return {
                 "function_selector": function_selector,
                 "signature": "unknown",
-                "raw_params": params_data,
+                "raw_params": params_bytes.hex(),
                 "decoded": False,
                 "warning": "Function signature not found in database"
             }
@@ -58,21 +258,25 @@ class CalldataDecoder:
         # Decode parameters
         try:
             decoded_params = self._decode_parameters(
-                params_data,
-                signature_info["params"]
+                params_bytes,
+                signature_info["params"],
+                types_only=signature_info["types_only"],
+                names=signature_info["param_names"]
             )
 
-            return {
+            result = {
                 "function_selector": function_selector,
                 "function_name": signature_info["name"],
                 "signature": signature_info["signature"],
-                "parameters": decoded_params,
+                "parameters": [p._asdict() for p in decoded_params],
                 "decoded": True,
-                "human_readable": self._format_human_readable(
+            }
+            if human_readable:
+                result["human_readable"] = self._format_human_readable(
                     signature_info["name"],
                     decoded_params
                 )
-            }
+            return result
 
         except Exception as e:
             logger.error(f"Failed to decode parameters: {e}")
@@ -80,99 +284,134 @@ class CalldataDecoder:
                 "function_selector": function_selector,
                 "function_name": signature_info["name"],
                 "signature": signature_info["signature"],
-                "raw_params": params_data,
+                "raw_params": params_bytes.hex(),
                 "decoded": False,
                 "error": f"Parameter decoding failed: {str(e)}"
             }
 
     def _decode_parameters(
         self,
-        params_hex: str,
-        param_types: List[str]
-    ) -> List[Dict]:
-        """Decode hex parameters using ABI types"""
-        if not params_hex or not param_types:
+        params_bytes: bytes,
+        param_types: List[str],
+        types_only: Optional[List[str]] = None,
+        names: Optional[List[str]] = None
+    ) -> List[Param]:
+        """Decode parameter bytes using ABI types
+
+        Accepts pre-split `types_only`/`names` so cached signatures skip
+        the split pass entirely; otherwise each param is parsed once.
+        """
+        if not params_bytes or not param_types:
             return []
 
-        # Remove 0x if present
-        if params_hex.startswith("0x"):
-            params_hex = params_hex[2:]
-
-        # Convert to bytes
-        params_bytes = bytes.fromhex(params_hex)
+        # Split "type name" params in a single pass (types and names
+        # together) instead of once per output field
+        if types_only is None or names is None:
+            types_only, names = [], []
+            for i, param in enumerate(param_types):
+                type_part, _, name_part = param.partition(" ")
+                types_only.append(type_part)
+                names.append(name_part or f"param{i}")
+
+        # All-static signatures (the ERC20 common case) skip eth_abi
+        # entirely; otherwise decode + format through the generic path
+        formatted = self._try_fast_static_decode(types_only, params_bytes)
+        if formatted is None:
+            decoded_values = decode(types_only, params_bytes)
+            formatted = [
+                self._format_value(type_part, value)
+                for type_part, value in zip(types_only, decoded_values)
+            ]
+
+        # One fused pass over the pre-split arrays, preallocated
+        result: List[Param] = [None] * len(formatted)
+        for i, value in enumerate(formatted):
+            result[i] = Param(names[i], types_only[i], value)
+        return result
 
-        # Extract just the types (remove names if present)
-        types_only = []
-        for param in param_types:
-            # Extract type (before space if name is present)
-            if " " in param:
-                type_part = param.split(" ")[0]
-            else:
-                type_part = param
-            types_only.append(type_part)
-
-        # Decode using eth_abi
-        decoded_values = decode(types_only, params_bytes)
-
-        # Build result with names and values
-        result = []
-        for i, (param, value) in enumerate(zip(param_types, decoded_values)):
-            # Parse param name and type
-            if " " in param:
-                type_part, name_part = param.split(" ", 1)
+    def _try_fast_static_decode(
+        self,
+        types_only: List[str],
+        params_bytes: bytes
+    ) -> Optional[List[Any]]:
+        """Decode all-static parameters by direct 32-byte-word slicing
+
+        address/uintN/intN/bool/bytes32-only signatures dominate real
+        traffic and need no tokenizer: each value is one word. Words
+        are validated as strictly as eth_abi (zero padding on address
+        and bool, values within the declared uintN/intN range), and any
+        violation returns None so the caller's eth_abi fallback raises
+        the same error it always did. Also returns None when the
+        signature contains dynamic or array types.
+        """
+        # Type strings are examined once per signature (cached plan);
+        # the hot loop below dispatches on small int codes only
+        codes = _static_plan(tuple(types_only))
+        if codes is None or len(params_bytes) != len(codes) * 32:
+            return None
+
+        # Walk the payload through a memoryview so the 32-byte words are
+        # zero-copy views; bytes are only materialized by .hex()
+        mv = memoryview(params_bytes)
+        values: List[Any] = [None] * len(codes)
+        for i, (code, bits) in enumerate(codes):
+            word = mv[i * 32:(i + 1) * 32]
+            if code == _TC_UINT:
+                value = int.from_bytes(word, "big")
+                if value >> bits:
+                    return None
+                values[i] = value
+            elif code == _TC_ADDRESS:
+                if word[:12] != _PAD12:
+                    return None
+                values[i] = "0x" + word[12:].hex()
+            elif code == _TC_BOOL:
+                if word[:31] != _PAD31 or word[31] > 1:
+                    return None
+                values[i] = word[31] == 1
+            elif code == _TC_INT:
+                value = int.from_bytes(word, "big", signed=True)
+                bound = 1 << (bits - 1)
+                if value < -bound or value >= bound:
+                    return None
+                values[i] = value
             else:
-                type_part = param
-                name_part = f"param{i}"
-
-            result.append({
-                "name": name_part,
-                "type": type_part,
-                "value": self._format_value(type_part, value)
-            })
-
-        return result
+                values[i] = "0x" + word.hex()
+        return values
 
     def _format_value(self, param_type: str, value: Any) -> Any:
         """Format decoded value for JSON serialization"""
-        # Address
-        if param_type == "address":
-            if isinstance(value, bytes):
-                return "0x" + value.hex()
-            return value
+        family, element_type = _type_family(param_type)
 
-        # Bytes
-        if "bytes" in param_type:
-            if isinstance(value, bytes):
-                return "0x" + value.hex()
+        if family == "array":
+            # Formatted inline: the per-element work (.hex(), int()) is
+            # pure CPU that holds the GIL, so fanning it out to threads
+            # only adds submission overhead while still blocking the loop
+            if isinstance(value, (list, tuple)):
+                return [self._format_value(element_type, v) for v in value]
             return value
 
-        # Array
-        if "[]" in param_type:
+        if family == "tuple":
+            # eth_abi decodes tuples to python tuples; format each
+            # component by its own type so raw bytes inside (e.g.
+            # exactInput's packed path) become hex strings rather than
+            # leaking into the JSON encoder
             if isinstance(value, (list, tuple)):
-                return [self._format_value(param_type.replace("[]", ""), v) for v in value]
+                components = _tuple_component_types(param_type)
+                if len(components) == len(value):
+                    return [
+                        self._format_value(t, v)
+                        for t, v in zip(components, value)
+                    ]
+                return [_fmt_hex(v) for v in value]
             return value
 
-        # Uint/int
-        if "uint" in param_type or "int" in param_type:
-            return int(value) if value is not None else 0
-
-        # Bool
-        if param_type == "bool":
-            return bool(value)
-
-        # String
-        if param_type == "string":
-            if isinstance(value, bytes):
-                return value.decode("utf-8", errors="ignore")
-            return str(value)
-
-        # Default
-        return value
+        return _FAMILY_HANDLERS[family](value)
 
     def _format_human_readable(
         self,
         function_name: str,
-        parameters: List[Dict]
+        parameters: List[Param]
     ) -> str:
         """Format as human-readable description"""
         if not parameters:
@@ -180,22 +419,22 @@ class CalldataDecoder:
 
         param_strs = []
         for param in parameters:
-            value = param["value"]
+            value = param.value
 
             # Format based on type
-            if param["type"] == "address":
-                param_strs.append(f"{param['name']}={value}")
-            elif "uint" in param["type"]:
+            if param.type == "address":
+                param_strs.append(f"{param.name}={value}")
+            elif "uint" in param.type:
                 # Try to format large numbers
                 if isinstance(value, int) and value > 1000000000000000000:
                     # Likely wei/gwei amount
                     eth_value = value / 10**18
-                    param_strs.append(f"{param['name']}={eth_value:.6f} ({value} wei)")
+                    param_strs.append(f"{param.name}={eth_value:.6f} ({value} wei)")
                 else:
-                    param_strs.append(f"{param['name']}={value}")
+                    param_strs.append(f"{param.name}={value}")
             elif isinstance(value, list):
-                param_strs.append(f"{param['name']}=[{len(value)} items]")
+                param_strs.append(f"{param.name}=[{len(value)} items]")
             else:
-                param_strs.append(f"{param['name']}={value}")
+                param_strs.append(f"{param.name}={value}")
 
         return f"{function_name}({', '.join(param_strs)})"
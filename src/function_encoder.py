@@ -2,12 +2,45 @@
 Function Encoder - Build calldata from function signature and parameters
 """
 import logging
-from typing import Dict, List, Any
-from eth_abi import encode
+from functools import lru_cache
+from typing import Dict, List, Any, Tuple
+
+try:
+    # C-accelerated drop-in replacement for eth_abi (same call signatures)
+    from faster_eth_abi import encode
+except ImportError:
+    from eth_abi import encode
 from eth_utils import keccak, to_hex
 
+from .hex_fast import hex_to_bytes
+
 logger = logging.getLogger(__name__)
 
+# Precomputed selectors for the fixed-layout ERC20 helpers
+_TRANSFER_SEL = bytes.fromhex("a9059cbb")
+_APPROVE_SEL = bytes.fromhex("095ea7b3")
+_TRANSFER_FROM_SEL = bytes.fromhex("23b872dd")
+
+
+def _address_word(address: str) -> bytes:
+    """Left-pad an address to a 32-byte ABI word"""
+    addr_hex = address[2:] if address[:2] in ("0x", "0X") else address
+    return bytes.fromhex(addr_hex.zfill(64))
+
+
+@lru_cache(maxsize=2048)
+def _compile_signature(function_signature: str) -> Tuple[bytes, Tuple[str, ...]]:
+    """Compile a signature into (selector bytes, parameter types)
+
+    Memoized so keccak-256 and the parameter parser run once per
+    distinct signature; real traffic is dominated by a handful of
+    signatures (transfer, approve, transferFrom...).
+    """
+    sig = function_signature.replace(" ", "")
+    selector = keccak(text=sig)[:4]
+    param_types = tuple(FunctionEncoder._extract_param_types(sig))
+    return selector, param_types
+
 
 class FunctionEncoder:
     """Encode function calls into calldata"""
@@ -28,11 +61,9 @@ class FunctionEncoder:
             Dict with calldata and metadata
         """
         try:
-            # Calculate function selector
-            selector = self._get_function_selector(function_signature)
-
-            # Extract parameter types
-            param_types = self._extract_param_types(function_signature)
+            # Selector + parameter types, memoized per signature
+            selector_bytes, param_types = _compile_signature(function_signature)
+            selector = selector_bytes.hex()
 
             if len(parameters) != len(param_types):
                 return {
@@ -43,7 +74,7 @@ class FunctionEncoder:
             normalized_params = self._normalize_parameters(param_types, parameters)
 
             # Encode parameters
-            encoded_params = encode(param_types, normalized_params)
+            encoded_params = encode(list(param_types), normalized_params)
 
             # Combine selector + encoded params
             calldata = selector + encoded_params.hex()
@@ -67,16 +98,10 @@ class FunctionEncoder:
 
     def _get_function_selector(self, function_signature: str) -> str:
         """Calculate 4-byte function selector"""
-        # Remove spaces
-        sig = function_signature.replace(" ", "")
-
-        # Calculate keccak256
-        hash_bytes = keccak(text=sig)
+        return _compile_signature(function_signature)[0].hex()
 
-        # Take first 4 bytes
-        return hash_bytes[:4].hex()
-
-    def _extract_param_types(self, function_signature: str) -> List[str]:
+    @staticmethod
+    def _extract_param_types(function_signature: str) -> List[str]:
         """Extract parameter types from signature"""
         if "(" not in function_signature or ")" not in function_signature:
             return []
@@ -88,27 +113,23 @@ class FunctionEncoder:
         if not params_str:
             return []
 
-        # Split by comma, handling nested types
-        types = []
+        # Single pass recording top-level comma offsets, then emit
+        # slices - avoids growing each type string one char at a time
+        splits = []
         depth = 0
-        current = ""
-
-        for char in params_str:
+        for i, char in enumerate(params_str):
             if char == "," and depth == 0:
-                if current:
-                    types.append(current.strip())
-                current = ""
-            else:
-                if char in "([":
-                    depth += 1
-                elif char in ")]":
-                    depth -= 1
-                current += char
-
-        if current:
-            types.append(current.strip())
-
-        return types
+                splits.append(i)
+            elif char in "([":
+                depth += 1
+            elif char in ")]":
+                depth -= 1
+
+        starts = [0] + [i + 1 for i in splits]
+        ends = splits + [len(params_str)]
+        return [
+            t for t in (params_str[a:b].strip() for a, b in zip(starts, ends)) if t
+        ]
 
     def _normalize_parameters(
         self,
@@ -116,74 +137,74 @@ class FunctionEncoder:
         parameters: List[Any]
     ) -> List[Any]:
         """Normalize parameters for encoding"""
-        normalized = []
-
-        for param_type, value in zip(param_types, parameters):
-            # Address - ensure checksum format
-            if param_type == "address":
-                if isinstance(value, str):
-                    # Remove 0x prefix if present
-                    addr = value.lower().replace("0x", "")
-                    # Pad to 20 bytes if needed
-                    if len(addr) < 40:
-                        addr = addr.zfill(40)
-                    normalized.append("0x" + addr)
-                else:
-                    normalized.append(value)
-
-            # Bytes - ensure hex format
-            elif "bytes" in param_type:
-                if isinstance(value, str):
-                    # Remove 0x prefix if present
-                    hex_val = value.replace("0x", "")
-                    normalized.append(bytes.fromhex(hex_val))
-                else:
-                    normalized.append(value)
-
-            # Uint/Int - ensure int type
-            elif "uint" in param_type or "int" in param_type:
-                normalized.append(int(value))
-
-            # Bool
-            elif param_type == "bool":
-                normalized.append(bool(value))
-
-            # String
-            elif param_type == "string":
-                normalized.append(str(value))
-
-            # Array
-            elif "[]" in param_type:
-                if isinstance(value, list):
-                    element_type = param_type.replace("[]", "")
-                    normalized.append([
-                        self._normalize_parameters([element_type], [v])[0]
-                        for v in value
-                    ])
-                else:
-                    normalized.append(value)
-
-            # Default
-            else:
-                normalized.append(value)
-
-        return normalized
+        return [
+            self._normalize_single(param_type, value)
+            for param_type, value in zip(param_types, parameters)
+        ]
+
+    def _normalize_single(self, param_type: str, value: Any) -> Any:
+        """Normalize a single value for its ABI type"""
+        # Address - strip only a leading 0x and left-pad to 20 bytes
+        # (one slice; the ABI encoder ignores checksum case, and
+        # str.replace also clobbered interior '0x' sequences)
+        if param_type == "address":
+            if isinstance(value, str):
+                addr = value[2:] if value[:2] in ("0x", "0X") else value
+                if len(addr) < 40:
+                    addr = addr.zfill(40)
+                return "0x" + addr
+            return value
+
+        # Bytes - ensure hex format
+        if "bytes" in param_type:
+            if isinstance(value, str):
+                return hex_to_bytes(value)
+            return value
+
+        # Uint/Int - ensure int type
+        if "uint" in param_type or "int" in param_type:
+            return int(value)
+
+        # Bool
+        if param_type == "bool":
+            return bool(value)
+
+        # String
+        if param_type == "string":
+            return str(value)
+
+        # Array - recurse per element directly, no wrapper lists
+        if "[]" in param_type:
+            if isinstance(value, list):
+                element_type = param_type.replace("[]", "")
+                return [self._normalize_single(element_type, v) for v in value]
+            return value
+
+        # Default
+        return value
 
     def build_erc20_transfer(self, to_address: str, amount: int) -> str:
-        """Helper: Build ERC20 transfer calldata"""
-        result = self.encode_function_call(
-            "transfer(address,uint256)",
-            [to_address, amount]
+        """Helper: Build ERC20 transfer calldata
+
+        The (address,uint256) layout is static, so the calldata is
+        assembled directly instead of going through the generic
+        encoder (no keccak, no signature parsing, no ABI dispatch).
+        """
+        buf = (
+            _TRANSFER_SEL
+            + _address_word(to_address)
+            + int(amount).to_bytes(32, "big")
         )
-        return result.get("calldata", "")
+        return "0x" + buf.hex()
 
     def build_erc20_approve(self, spender_address: str, amount: int) -> str:
-        """Helper: Build ERC20 approve calldata"""
-        result = self.encode_function_call(
-            "approve(address,uint256)",
-            [spender_address, amount]
+        """Helper: Build ERC20 approve calldata (fixed layout)"""
+        buf = (
+            _APPROVE_SEL
+            + _address_word(spender_address)
+            + int(amount).to_bytes(32, "big")
         )
-        return result.get("calldata", "")
+        return "0x" + buf.hex()
 
     def build_erc20_transfer_from(
         self,
@@ -191,9 +212,22 @@ class FunctionEncoder:
         to_address: str,
         amount: int
     ) -> str:
-        """Helper: Build ERC20 transferFrom calldata"""
-        result = self.encode_function_call(
-            "transferFrom(address,address,uint256)",
-            [from_address, to_address, amount]
+        """Helper: Build ERC20 transferFrom calldata (fixed layout)"""
+        buf = (
+            _TRANSFER_FROM_SEL
+            + _address_word(from_address)
+            + _address_word(to_address)
+            + int(amount).to_bytes(32, "big")
         )
-        return result.get("calldata", "")
+        return "0x" + buf.hex()
+
+
+# Warm the signature cache for the ERC20 helpers so their first call
+# skips keccak and signature parsing entirely
+for _sig in (
+    "transfer(address,uint256)",
+    "approve(address,uint256)",
+    "transferFrom(address,address,uint256)",
+):
+    _compile_signature(_sig)
+del _sig
@@ -0,0 +1,26 @@
+"""
+Fast hex <-> bytes helpers shared by the decoder and encoder hot paths
+
+CPython's bytes.fromhex / bytes.hex are C implementations driven by a
+256-entry lookup table, so the fastest portable path is to funnel every
+conversion through them exactly once. Centralizing the conversions here
+also gives a single seam for dropping in an accelerated codec later.
+"""
+from typing import Union
+
+HexLike = Union[bytes, bytearray, memoryview]
+
+
+def hex_to_bytes(value: str) -> bytes:
+    """Parse a hex string (with or without 0x prefix) into bytes
+
+    Raises ValueError on non-hex input, matching bytes.fromhex.
+    """
+    if value.startswith(("0x", "0X")):
+        value = value[2:]
+    return bytes.fromhex(value)
+
+
+def bytes_to_hex(value: HexLike) -> str:
+    """Format bytes (or a memoryview) as a 0x-prefixed hex string"""
+    return "0x" + value.hex()
@@ -0,0 +1,233 @@
+"""
+Built-in selector lookup table for the most common on-chain functions
+
+Curated from ERC20/ERC721/ERC1155, WETH, Uniswap V2/V3, and multicall
+traffic, which covers the bulk of real-world calldata. Entries here are
+resolved synchronously by the decoder before any async signature lookup
+is attempted, so hot selectors never cross the await boundary.
+"""
+from collections import namedtuple
+from typing import Dict
+
+# Immutable signature record shared with SignatureLookup; namedtuples
+# are lighter than per-entry dicts and read via attribute access
+SigInfo = namedtuple("SigInfo", "name signature params")
+
+SELECTOR_LUT: Dict[str, SigInfo] = {
+    # ERC20
+    "0xa9059cbb": SigInfo(
+        name="transfer",
+        signature="transfer(address,uint256)",
+        params=("address recipient", "uint256 amount",),
+    ),
+    "0x095ea7b3": SigInfo(
+        name="approve",
+        signature="approve(address,uint256)",
+        params=("address spender", "uint256 amount",),
+    ),
+    "0x23b872dd": SigInfo(
+        name="transferFrom",
+        signature="transferFrom(address,address,uint256)",
+        params=("address sender", "address recipient", "uint256 amount",),
+    ),
+    "0x70a08231": SigInfo(
+        name="balanceOf",
+        signature="balanceOf(address)",
+        params=("address account",),
+    ),
+    "0x18160ddd": SigInfo(
+        name="totalSupply",
+        signature="totalSupply()",
+        params=(),
+    ),
+    "0xdd62ed3e": SigInfo(
+        name="allowance",
+        signature="allowance(address,address)",
+        params=("address owner", "address spender",),
+    ),
+    "0x313ce567": SigInfo(
+        name="decimals",
+        signature="decimals()",
+        params=(),
+    ),
+    "0x06fdde03": SigInfo(
+        name="name",
+        signature="name()",
+        params=(),
+    ),
+    "0x95d89b41": SigInfo(
+        name="symbol",
+        signature="symbol()",
+        params=(),
+    ),
+    "0x40c10f19": SigInfo(
+        name="mint",
+        signature="mint(address,uint256)",
+        params=("address to", "uint256 amount",),
+    ),
+    "0x42966c68": SigInfo(
+        name="burn",
+        signature="burn(uint256)",
+        params=("uint256 amount",),
+    ),
+    "0xd505accf": SigInfo(
+        name="permit",
+        signature="permit(address,address,uint256,uint256,uint8,bytes32,bytes32)",
+        params=(
+            "address owner", "address spender", "uint256 value",
+            "uint256 deadline", "uint8 v", "bytes32 r", "bytes32 s",
+        ),
+    ),
+    # ERC721
+    "0x42842e0e": SigInfo(
+        name="safeTransferFrom",
+        signature="safeTransferFrom(address,address,uint256)",
+        params=("address from", "address to", "uint256 tokenId",),
+    ),
+    "0xb88d4fde": SigInfo(
+        name="safeTransferFrom",
+        signature="safeTransferFrom(address,address,uint256,bytes)",
+        params=("address from", "address to", "uint256 tokenId", "bytes data",),
+    ),
+    "0x6352211e": SigInfo(
+        name="ownerOf",
+        signature="ownerOf(uint256)",
+        params=("uint256 tokenId",),
+    ),
+    "0xa22cb465": SigInfo(
+        name="setApprovalForAll",
+        signature="setApprovalForAll(address,bool)",
+        params=("address operator", "bool approved",),
+    ),
+    "0x081812fc": SigInfo(
+        name="getApproved",
+        signature="getApproved(uint256)",
+        params=("uint256 tokenId",),
+    ),
+    "0xe985e9c5": SigInfo(
+        name="isApprovedForAll",
+        signature="isApprovedForAll(address,address)",
+        params=("address owner", "address operator",),
+    ),
+    "0xc87b56dd": SigInfo(
+        name="tokenURI",
+        signature="tokenURI(uint256)",
+        params=("uint256 tokenId",),
+    ),
+    # ERC1155
+    "0xf242432a": SigInfo(
+        name="safeTransferFrom",
+        signature="safeTransferFrom(address,address,uint256,uint256,bytes)",
+        params=(
+            "address from", "address to", "uint256 id",
+            "uint256 amount", "bytes data",
+        ),
+    ),
+    "0x2eb2c2d6": SigInfo(
+        name="safeBatchTransferFrom",
+        signature="safeBatchTransferFrom(address,address,uint256[],uint256[],bytes)",
+        params=(
+            "address from", "address to", "uint256[] ids",
+            "uint256[] amounts", "bytes data",
+        ),
+    ),
+    "0x4e1273f4": SigInfo(
+        name="balanceOfBatch",
+        signature="balanceOfBatch(address[],uint256[])",
+        params=("address[] accounts", "uint256[] ids",),
+    ),
+    # WETH
+    "0xd0e30db0": SigInfo(
+        name="deposit",
+        signature="deposit()",
+        params=(),
+    ),
+    "0x2e1a7d4d": SigInfo(
+        name="withdraw",
+        signature="withdraw(uint256)",
+        params=("uint256 wad",),
+    ),
+    # Uniswap V2 router
+    "0x7ff36ab5": SigInfo(
+        name="swapExactETHForTokens",
+        signature="swapExactETHForTokens(uint256,address[],address,uint256)",
+        params=(
+            "uint256 amountOutMin", "address[] path",
+            "address to", "uint256 deadline",
+        ),
+    ),
+    "0x38ed1739": SigInfo(
+        name="swapExactTokensForTokens",
+        signature="swapExactTokensForTokens(uint256,uint256,address[],address,uint256)",
+        params=(
+            "uint256 amountIn", "uint256 amountOutMin", "address[] path",
+            "address to", "uint256 deadline",
+        ),
+    ),
+    "0x18cbafe5": SigInfo(
+        name="swapExactTokensForETH",
+        signature="swapExactTokensForETH(uint256,uint256,address[],address,uint256)",
+        params=(
+            "uint256 amountIn", "uint256 amountOutMin", "address[] path",
+            "address to", "uint256 deadline",
+        ),
+    ),
+    "0x8803dbee": SigInfo(
+        name="swapTokensForExactTokens",
+        signature="swapTokensForExactTokens(uint256,uint256,address[],address,uint256)",
+        params=(
+            "uint256 amountOut", "uint256 amountInMax", "address[] path",
+            "address to", "uint256 deadline",
+        ),
+    ),
+    "0xe8e33700": SigInfo(
+        name="addLiquidity",
+        signature="addLiquidity(address,address,uint256,uint256,uint256,uint256,address,uint256)",
+        params=(
+            "address tokenA", "address tokenB", "uint256 amountADesired",
+            "uint256 amountBDesired", "uint256 amountAMin",
+            "uint256 amountBMin", "address to", "uint256 deadline",
+        ),
+    ),
+    "0xbaa2abde": SigInfo(
+        name="removeLiquidity",
+        signature="removeLiquidity(address,address,uint256,uint256,uint256,address,uint256)",
+        params=(
+            "address tokenA", "address tokenB", "uint256 liquidity",
+            "uint256 amountAMin", "uint256 amountBMin",
+            "address to", "uint256 deadline",
+        ),
+    ),
+    # Uniswap V3 router
+    "0x414bf389": SigInfo(
+        name="exactInputSingle",
+        signature="exactInputSingle((address,address,uint24,address,uint256,uint256,uint256,uint160))",
+        params=("(address,address,uint24,address,uint256,uint256,uint256,uint160) params",),
+    ),
+    "0xc04b8d59": SigInfo(
+        name="exactInput",
+        signature="exactInput((bytes,address,uint256,uint256,uint256))",
+        params=("(bytes,address,uint256,uint256,uint256) params",),
+    ),
+    "0xdb3e2198": SigInfo(
+        name="exactOutputSingle",
+        signature="exactOutputSingle((address,address,uint24,address,uint256,uint256,uint256,uint160))",
+        params=("(address,address,uint24,address,uint256,uint256,uint256,uint160) params",),
+    ),
+    # Multicall / universal router
+    "0xac9650d8": SigInfo(
+        name="multicall",
+        signature="multicall(bytes[])",
+        params=("bytes[] data",),
+    ),
+    "0x5ae401dc": SigInfo(
+        name="multicall",
+        signature="multicall(uint256,bytes[])",
+        params=("uint256 deadline", "bytes[] data",),
+    ),
+    "0x3593564c": SigInfo(
+        name="execute",
+        signature="execute(bytes,bytes[],uint256)",
+        params=("bytes commands", "bytes[] inputs", "uint256 deadline",),
+    ),
+}
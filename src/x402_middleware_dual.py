@@ -24,6 +24,10 @@ class X402Middleware(BaseHTTPMiddleware):
     2. Coinbase CDP facilitator (fallback + Bazaar registration)
     """
 
+    # Paths exempt from payment verification (exact matches / prefixes)
+    DEFAULT_SKIP_PATHS = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json", "/favicon.ico"})
+    DEFAULT_SKIP_PREFIXES = ("/.well-known/",)
+
     def __init__(
         self,
         app,
@@ -31,11 +35,15 @@ class X402Middleware(BaseHTTPMiddleware):
         base_url: str,
         facilitator_urls: List[str] = None,
         free_mode: bool = False,
+        skip_paths: Optional[frozenset] = None,
+        skip_prefixes: Optional[Tuple[str, ...]] = None,
     ):
         super().__init__(app)
         self.payment_address = payment_address
         self.base_url = base_url
         self.free_mode = free_mode
+        self.skip_paths = self.DEFAULT_SKIP_PATHS if skip_paths is None else frozenset(skip_paths)
+        self.skip_prefixes = self.DEFAULT_SKIP_PREFIXES if skip_prefixes is None else tuple(skip_prefixes)
 
         # Default to both facilitators if not specified
         if facilitator_urls is None:
@@ -200,18 +208,18 @@ class X402Middleware(BaseHTTPMiddleware):
 
     async def dispatch(self, request: Request, call_next):
         """Process request and verify payment if required"""
+        path = request.url.path
+
+        # Fast path first: exempt endpoints (health probes, docs,
+        # discovery documents) skip all payment logic outright
+        if path in self.skip_paths or path.startswith(self.skip_prefixes):
+            return await call_next(request)
 
         # Skip payment verification in free mode
         if self.free_mode:
             logger.debug("FREE_MODE enabled, skipping payment verification")
             return await call_next(request)
 
-        # Skip verification for health check and metadata endpoints
-        skip_paths = ["/health", "/.well-known", "/docs", "/redoc", "/openapi.json"]
-        # Check for exact root path match separately
-        if request.url.path == "/" or any(request.url.path.startswith(path) for path in skip_paths):
-            return await call_next(request)
-
         # Check for payment endpoints (those that require payment)
         # These are typically POST endpoints that provide actual functionality
         requires_payment = (